@@ -1,4 +1,4 @@
-from typing import List, Generator
+from typing import List, Tuple
 
 from cipher.base import StreamCipher
 from utils import BYTE_BITS
@@ -20,28 +20,38 @@ MAX_KEY_BYTES = 256
 def _ksa(key_ints: List[int]) -> List[int]:
     """Initialize the key permutation using key-scheduling
     algorithm (KSA)."""
-
+    # A list is kept over array('H') or np.uint16: indexing those from
+    # Python boxes every element, which makes the loops noticeably slower.
     s = list(range(S_SIZE))
+    s_mask = S_SIZE - 1
 
+    key_len = len(key_ints)
     j = 0
     for i in range(S_SIZE):
-        j = (j + s[i] + key_ints[i % len(key_ints)]) % S_SIZE
-        s[i], s[j] = s[j], s[i]
+        s_i = s[i]
+        j = (j + s_i + key_ints[i % key_len]) & s_mask
+        s[i], s[j] = s[j], s_i
 
     return s
 
 
-def _prga_generator(s: List[int]) -> Generator[int, None, None]:
-    """Generator function implementing pseudo-random generation
-    algorithm (PRGA)."""
-    i = 0
-    j = 0
-    while True:
-        i = (i + 1) % S_SIZE
-        j = (j + s[i]) % S_SIZE
-        s[i], s[j] = s[j], s[i]
-        k_elem = s[(s[i] + s[j]) % S_SIZE]
-        yield k_elem
+def _prga(s: List[int], i: int, j: int,
+          input_bytes: bytes) -> Tuple[bytes, int, int]:
+    """Xor the input bytes with the key stream produced by pseudo-random
+    generation algorithm (PRGA), starting from the state (i, j)."""
+    s_mask = S_SIZE - 1
+    byte_mask = 2 ** BYTE_BITS - 1
+
+    output = bytearray(len(input_bytes))
+    for k, input_int in enumerate(input_bytes):
+        i = (i + 1) & s_mask
+        s_i = s[i]
+        j = (j + s_i) & s_mask
+        s_j = s[j]
+        s[i], s[j] = s_j, s_i
+        output[k] = input_int ^ (s[(s_i + s_j) & s_mask] & byte_mask)
+
+    return bytes(output), i, j
 
 
 class ARC4(StreamCipher):
@@ -50,7 +60,8 @@ class ARC4(StreamCipher):
     def __init__(self, key_bytes: int = MAX_KEY_BYTES) -> None:
         self.__validate_init_params(key_bytes)
         super().__init__(key_bytes)
-        self.__prga = None
+        self.__s = None
+        self.__i = self.__j = 0
 
     @staticmethod
     def __validate_init_params(key_bytes: int) -> None:
@@ -60,11 +71,15 @@ class ARC4(StreamCipher):
     def _set_key(self, key: str, is_encrypt: bool) -> None:
         """Validate and set the key."""
         key_ints = self._preprocess_key(key)
-        s = _ksa(key_ints)
-        self.__prga = _prga_generator(s)
+        self.__s = _ksa(key_ints)
+        self.__i = self.__j = 0
 
     def _process(self, input_int: int) -> int:
         """Process the input's integer (works in both ways)."""
-        key_int = next(self.__prga)
-        output_int = input_int ^ key_int
-        return output_int % 2 ** BYTE_BITS
+        return self._process_bulk(bytes([input_int]))[0]
+
+    def _process_bulk(self, input_bytes: bytes) -> bytes:
+        """Process the input's bytes (works in both ways)."""
+        output_bytes, self.__i, self.__j = _prga(self.__s, self.__i,
+                                                 self.__j, input_bytes)
+        return output_bytes
@@ -1,24 +1,53 @@
 from abc import ABC, abstractmethod
-from typing import List, TextIO
+from functools import lru_cache
+from typing import Callable, List, TextIO
+
+import numpy as np
 
 from errors import EmptyKeyError, InputLengthError
 from utils import (
-    ints_to_chars, chars_to_ints,
-    HEX_LENGTH, int_to_hex, hex_to_int,
-    ints_to_hexes, hex_str_to_ints,
+    chars_to_ints, str_to_codes,
+    HEX_LENGTH, IO_CHUNK_BYTES,
+    hex_str_to_bytes,
     add_padding, remove_padding
 )
-from validators import char_int_allowed
+from validators import char_int_allowed, chars_allowed
+
+# Number of keys, for which the key schedules are cached.
+KEY_CACHE_SIZE = 32
+
+
+def cache_key_schedule(function: Callable) -> Callable:
+    """Cache the key schedules derived by the function, so the recently used
+    keys are kept in memory."""
+    return lru_cache(maxsize=KEY_CACHE_SIZE)(function)
 
 
 class Cipher:
     """Class that encapsulates general cipher's logic."""
 
     @staticmethod
-    def _validate_input(input_ints: List[int]) -> None:
-        """Validate the input."""
-        for num in input_ints:
-            char_int_allowed(num)
+    def _validate_input_bulk(input_codes: np.ndarray) -> None:
+        """Validate the input given as an array of chars' code points."""
+        chars_allowed(input_codes)
+
+    @staticmethod
+    def _decrypt_padded(cipher: TextIO, text: TextIO, chunk_size: int,
+                        decrypt_chunk: Callable[[str], str]) -> None:
+        """Decrypt the cipher chunk by chunk and strip the trailing padding
+        chars from the text."""
+        # Trailing padding chars are held back until more text follows.
+        padding = ''
+        while True:
+            cipher_chunk = cipher.read(chunk_size)
+            if cipher_chunk == '':
+                break
+
+            text_chunk = padding + decrypt_chunk(cipher_chunk)
+            stripped_chunk = text_chunk.rstrip('\x01')
+            padding = text_chunk[len(stripped_chunk):]
+
+            text.write(stripped_chunk)
 
 
 class KeyCipher(ABC, Cipher):
@@ -70,100 +99,143 @@ class StreamCipher(KeyCipher):
         """Process the input's integer."""
         pass
 
+    def _process_bulk(self, input_bytes: bytes) -> bytes:
+        """Process the input's bytes."""
+        return bytes(map(self._process, input_bytes))
+
     def encrypt(self, text: TextIO, key: str, cipher: TextIO) -> None:
         """Encrypt the text using the key."""
         super().encrypt(text, key, cipher)
 
         while True:
-            text_char = text.read(1)
-            if text_char == '':
+            text_chunk = text.read(IO_CHUNK_BYTES)
+            if text_chunk == '':
                 break
 
-            text_int = ord(text_char)
-            char_int_allowed(text_int)
+            text_codes = str_to_codes(text_chunk)
+            self._validate_input_bulk(text_codes)
+
+            text_bytes = text_codes.astype(np.uint8).tobytes()
 
-            cipher_int = self._process(text_int)
+            cipher_bytes = self._process_bulk(text_bytes)
 
-            cipher.write(int_to_hex(cipher_int))
+            cipher.write(cipher_bytes.hex().upper())
 
     def decrypt(self, cipher: TextIO, key: str, text: TextIO) -> None:
         """Decrypt the cipher using the key."""
         super().decrypt(cipher, key, text)
 
         while True:
-            cipher_hex = cipher.read(HEX_LENGTH)
-            if cipher_hex == '':
+            cipher_chunk = cipher.read(IO_CHUNK_BYTES * HEX_LENGTH)
+            if cipher_chunk == '':
                 break
 
-            cipher_int = hex_to_int(cipher_hex)
-            char_int_allowed(cipher_int)
+            cipher_bytes = hex_str_to_bytes(cipher_chunk)
 
-            text_int = self._process(cipher_int)
+            text_bytes = self._process_bulk(cipher_bytes)
 
-            text.write(chr(text_int))
+            text.write(text_bytes.decode('latin-1'))
 
 
 class BlockCipher(KeyCipher):
     """Class that encapsulates general block cipher's logic."""
 
+    # Function deriving the key schedule, if it is cached by the cipher.
+    _key_schedule = None
+
     def __init__(self, block_bytes: int, key_bytes: int) -> None:
         super().__init__(key_bytes)
         self.block_bytes = block_bytes
 
-    @abstractmethod
-    def _encrypt_block_ints(self, block_ints: List[int]) -> List[int]:
-        """Encrypt the text block's integers."""
-        pass
-
-    def __encrypt_block(self, block: str) -> str:
-        """Encrypt the text block."""
-        block_ints = chars_to_ints(block)
-        self._validate_input(block_ints)
-        block_ints = add_padding(block_ints, self.block_bytes)
+    @classmethod
+    def clear_key_cache(cls) -> None:
+        """Remove the cached key schedules (and so the keys) from memory."""
+        if cls._key_schedule is not None:
+            cls._key_schedule.cache_clear()
 
-        cipher_ints = self._encrypt_block_ints(block_ints)
-        cipher = ''.join(ints_to_hexes(cipher_ints))
+    @property
+    def _chunk_bytes(self) -> int:
+        """Number of bytes read from the input at once (a multiple of the
+        block's length)."""
+        return IO_CHUNK_BYTES // self.block_bytes * self.block_bytes
 
-        return cipher
+    def _encrypt_block_ints(self, block_ints: List[int]) -> List[int]:
+        """Encrypt the text block's integers. Ciphers override either this
+        method or its batched counterpart."""
+        blocks = np.array([block_ints], np.uint8)
+        return self._encrypt_blocks_ints(blocks)[0].tolist()
+
+    def _encrypt_blocks_ints(self, blocks: np.ndarray) -> np.ndarray:
+        """Encrypt the text blocks' integers (one block per row)."""
+        return np.array([self._encrypt_block_ints(block.tolist())
+                         for block in blocks], np.uint8)
+
+    def __encrypt_chunk(self, chunk: str) -> str:
+        """Encrypt the text chunk."""
+        chunk_codes = str_to_codes(chunk)
+        self._validate_input_bulk(chunk_codes)
+        chunk_ints = chunk_codes.astype(np.uint8)
+
+        tail_i = len(chunk_ints) - len(chunk_ints) % self.block_bytes
+        if tail_i < len(chunk_ints):
+            tail_ints = add_padding(chunk_ints[tail_i:].tolist(),
+                                    self.block_bytes)
+            chunk_ints = np.append(chunk_ints[:tail_i],
+                                   np.array(tail_ints, np.uint8))
+
+        blocks = chunk_ints.reshape(-1, self.block_bytes)
+        cipher_blocks = self._encrypt_blocks_ints(blocks)
+
+        return cipher_blocks.tobytes().hex().upper()
 
     def encrypt(self, text: TextIO, key: str, cipher: TextIO) -> None:
         """Encrypt the text using the key."""
         super().encrypt(text, key, cipher)
 
         while True:
-            text_block = text.read(self.block_bytes)
-            if text_block == '':
+            text_chunk = text.read(self._chunk_bytes)
+            if text_chunk == '':
                 break
 
-            cipher_block = self.__encrypt_block(text_block)
-            cipher.write(cipher_block)
+            cipher_chunk = self.__encrypt_chunk(text_chunk)
+            cipher.write(cipher_chunk)
 
-    @abstractmethod
     def _decrypt_block_ints(self, block_ints: List[int]) -> List[int]:
-        """Decrypt the cipher block's integers."""
-        pass
-
-    def __decrypt_block(self, block: str) -> str:
-        """Decrypt the cipher block."""
-        block_ints = hex_str_to_ints(block, HEX_LENGTH)
-        self._validate_input(block_ints)
-
-        if len(block_ints) < self.block_bytes:
+        """Decrypt the cipher block's integers. Ciphers override either this
+        method or its batched counterpart."""
+        blocks = np.array([block_ints], np.uint8)
+        return self._decrypt_blocks_ints(blocks)[0].tolist()
+
+    def _decrypt_blocks_ints(self, blocks: np.ndarray) -> np.ndarray:
+        """Decrypt the cipher blocks' integers (one block per row)."""
+        return np.array([self._decrypt_block_ints(block.tolist())
+                         for block in blocks], np.uint8)
+
+    def __decrypt_chunk(self, chunk: str) -> str:
+        """Decrypt the cipher chunk."""
+        if len(chunk) % (self.block_bytes * HEX_LENGTH) != 0:
             raise InputLengthError(self.block_bytes)
 
-        text_ints = self._decrypt_block_ints(block_ints)
-        text = ''.join(ints_to_chars(text_ints))
+        chunk_ints = np.frombuffer(hex_str_to_bytes(chunk), np.uint8)
+
+        blocks = chunk_ints.reshape(-1, self.block_bytes)
+        text_blocks = self._decrypt_blocks_ints(blocks)
 
-        return remove_padding(text)
+        return text_blocks.tobytes().decode('latin-1')
 
     def decrypt(self, cipher: TextIO, key: str, text: TextIO) -> None:
         """Decrypt the cipher using the key."""
         super().decrypt(cipher, key, text)
 
+        # The last block is held back, since only it may contain padding.
+        last_block = ''
         while True:
-            cipher_block = cipher.read(self.block_bytes * HEX_LENGTH)
-            if cipher_block == '':
+            cipher_chunk = cipher.read(self._chunk_bytes * HEX_LENGTH)
+            if cipher_chunk == '':
                 break
 
-            text_block = self.__decrypt_block(cipher_block)
-            text.write(text_block)
+            text_chunk = last_block + self.__decrypt_chunk(cipher_chunk)
+            last_block = text_chunk[-self.block_bytes:]
+            text.write(text_chunk[:-self.block_bytes])
+
+        text.write(remove_padding(last_block))
@@ -1,9 +1,10 @@
-from typing import Generator, TextIO
+from typing import TextIO, Tuple
 
 import numpy as np
 
 from cipher.base import Cipher
 from errors import MaskNotValidError, InputLengthError
+from utils import IO_CHUNK_BYTES, str_to_codes, codes_to_str
 
 # Number of grille's flips.
 FLIPS_N = 4
@@ -11,11 +12,8 @@ FLIPS_N = 4
 # Sign with which mask's empty cells are marked.
 EMPTY_CELL = 'x'
 
-
-def _char_generator(string: str) -> Generator[str, None, None]:
-    """Generator function which returns single chars of the string."""
-    for char in string:
-        yield char
+# Type alias for a tuple of empty cells' flat indices for each flip.
+EmptyIdx = Tuple[np.ndarray, ...]
 
 
 def load_mask(filename: str) -> np.ndarray:
@@ -30,7 +28,8 @@ class Cardan(Cipher):
     """Class that encapsulates the Cardan grille's logic."""
 
     def __init__(self) -> None:
-        self.__mask = None
+        self.__size = 0
+        self.__empty_idx = ()
 
     @staticmethod
     def __validate_mask(mask: np.ndarray) -> None:
@@ -38,39 +37,61 @@ class Cardan(Cipher):
         if len(mask.shape) != 2 or mask.shape[0] != mask.shape[1]:
             raise MaskNotValidError("Mask's shape must be square")
 
+    @staticmethod
+    def __validate_empty_idx(size: int, empty_idx: EmptyIdx) -> None:
+        """Validate that the empty cells of all flips fill the grille
+        exactly once."""
+        if sum(len(idx) for idx in empty_idx) > size:
+            raise MaskNotValidError("Too much empty cells in the mask")
+
+        covered = np.zeros(size, bool)
+        for idx in empty_idx:
+            covered[idx] = True
+
+        if not np.all(covered):
+            raise MaskNotValidError("Not enough empty cells in the mask")
+
     def __set_mask(self, mask: np.ndarray) -> None:
         """Validate and set the mask."""
         self.__validate_mask(mask)
-        self.__mask = mask
+
+        # Flat indices of the empty cells for each of the grille's flips,
+        # so that the mask never has to be rotated while processing.
+        empty_idx = tuple(
+            np.flatnonzero(np.rot90(mask, -k).ravel() == EMPTY_CELL)
+            for k in range(FLIPS_N)
+        )
+        self.__validate_empty_idx(mask.size, empty_idx)
+
+        self.__size = mask.size
+        self.__empty_idx = empty_idx
+
+    @property
+    def __chunk_size(self) -> int:
+        """Number of chars read from the input at once (a multiple of the
+        grille's size)."""
+        return max(IO_CHUNK_BYTES // self.__size, 1) * self.__size
 
     def __encrypt_chunk(self, text: str) -> str:
-        """Encrypt the text chunk."""
-        if len(text) < self.__mask.size:
-            text += '\x01' * (self.__mask.size - len(text))
-
-        text_gen = _char_generator(text)
-        grille = np.zeros(self.__mask.shape, 'U1')
-
-        try:
-            for flip_i in range(0, FLIPS_N):
-                empty_i = np.argwhere(self.__mask == EMPTY_CELL)
-                for i, j in empty_i:
-                    grille[i][j] = next(text_gen)
-                self.__mask = np.rot90(self.__mask, -1)
-        except StopIteration:
-            raise MaskNotValidError("Too much empty cells in the mask")
+        """Encrypt the text chunk (one or more grilles long)."""
+        text += '\x01' * (-len(text) % self.__size)
 
-        if np.any(grille == ''):
-            raise MaskNotValidError("Not enough empty cells in the mask")
+        texts = str_to_codes(text).reshape(-1, self.__size)
+        grilles = np.empty(texts.shape, np.uint32)
 
-        return ''.join(np.concatenate(grille))
+        offset = 0
+        for idx in self.__empty_idx:
+            grilles[:, idx] = texts[:, offset:offset + len(idx)]
+            offset += len(idx)
+
+        return codes_to_str(grilles.ravel())
 
     def encrypt(self, text: TextIO, mask: np.ndarray, cipher: TextIO) -> None:
         """"Encrypt the text using the mask."""
         self.__set_mask(mask)
 
         while True:
-            text_chunk = text.read(self.__mask.size)
+            text_chunk = text.read(self.__chunk_size)
             if text_chunk == '':
                 break
 
@@ -79,29 +100,19 @@ class Cardan(Cipher):
             cipher.write(cipher_chunk)
 
     def __decrypt_chunk(self, cipher: str) -> str:
-        """Decrypt the cipher chunk."""
-        if len(cipher) < self.__mask.size:
-            raise InputLengthError(self.__mask.size)
-
-        grille = np.array(list(cipher)).reshape(self.__mask.shape)
+        """Decrypt the cipher chunk (one or more grilles long)."""
+        if len(cipher) % self.__size != 0:
+            raise InputLengthError(self.__size)
 
-        text = ''
-        for flip_i in range(0, FLIPS_N):
-            text_chars = np.extract(self.__mask == EMPTY_CELL, grille)
-            text += ''.join(text_chars)
-            self.__mask = np.rot90(self.__mask, -1)
+        grilles = str_to_codes(cipher).reshape(-1, self.__size)
+        texts = np.concatenate([grilles[:, idx] for idx in self.__empty_idx],
+                               axis=1)
 
-        return text.rstrip('\x01')
+        return codes_to_str(texts.ravel())
 
     def decrypt(self, cipher: TextIO, mask: np.ndarray, text: TextIO) -> None:
         """"Decrypt the cipher using the mask."""
         self.__set_mask(mask)
 
-        while True:
-            cipher_chunk = cipher.read(self.__mask.size)
-            if cipher_chunk == '':
-                break
-
-            text_chunk = self.__decrypt_chunk(cipher_chunk)
-
-            text.write(text_chunk)
+        self._decrypt_padded(cipher, text, self.__chunk_size,
+                             self.__decrypt_chunk)
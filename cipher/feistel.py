@@ -21,71 +21,63 @@ BLOCK_BYTES = BLOCK_BITS // BYTE_BITS
 ROUNDS_N = 20
 
 
-def _round_function(left: np.ndarray, subkey: List[int]) -> np.ndarray:
+def _round_function(left: np.ndarray, subkey: np.ndarray) -> np.ndarray:
     """Xor function used for each round of processing."""
     return np.bitwise_xor(left, subkey)
 
 
+def _generate_subkeys(key_ints: List[int]) -> np.ndarray:
+    """Generate the subkeys of all rounds by shifted cyclic reading of
+    32-bit key."""
+    # The key is repeated, so that the last round's subkey can be read.
+    req_key_length = (ROUNDS_N + KEY_BITS) // BYTE_BITS + 1
+    cyclic_key_ints = (key_ints * req_key_length)[:req_key_length]
+    cyclic_key = bin_join(cyclic_key_ints, BYTE_BITS)
+    cyclic_key_width = req_key_length * BYTE_BITS
+
+    subkeys = []
+    for round_n in range(1, ROUNDS_N + 1):
+        subkey = bin_slice(cyclic_key, round_n, round_n + KEY_BITS,
+                           cyclic_key_width)
+        subkeys.append(bin_split(subkey, KEY_BITS, BYTE_BITS))
+
+    return np.array(subkeys, np.uint8)
+
+
 class Feistel(BlockCipher):
     """Class that encapsulates the Feistel network's logic."""
 
     def __init__(self) -> None:
         super().__init__(BLOCK_BYTES, KEY_BYTES)
-        self.__key_ints = None
+        self.__subkeys = None
 
     def _set_key(self, key: str, is_encrypt: bool) -> None:
         """Validate and set the key."""
-        self.__key_ints = self._preprocess_key(key)
-
-    def __get_subkey(self, round_n: int) -> List[int]:
-        """Function used for subkey generation by shifted cyclic reading of
-        32-bit key."""
-        key_ints = self.__key_ints
-
-        bytes_cut = round_n // BYTE_BITS
-        bits_cut = round_n % BYTE_BITS
-
-        # +1 because in order to slice we need to have some extra bits.
-        req_key_length = bytes_cut + self.key_bytes + 1
-        while len(key_ints) < req_key_length:
-            key_ints += key_ints
-
-        key_ints = key_ints[bytes_cut:req_key_length]
-        subkey = bin_join(key_ints, BYTE_BITS)
-        subkey_width = len(key_ints) * BYTE_BITS
-
-        key_bits = self.key_bytes * BYTE_BITS
-        subkey = bin_slice(subkey, bits_cut, key_bits + bits_cut, subkey_width)
-
-        subkey_ints = bin_split(subkey, key_bits, BYTE_BITS)
-
-        return subkey_ints
-
-    def __process_block(self, block_ints: List[int],
-                        is_encrypt: bool) -> List[int]:
-        """Process the input block's integers (works in both ways)."""
-        block_ints = np.array(block_ints)
-
-        chunk_middle = len(block_ints) // 2
-        left = block_ints[:chunk_middle]
-        right = block_ints[chunk_middle:]
-
-        round_nums = list(range(1, ROUNDS_N + 1))
-        if not is_encrypt:
-            round_nums.reverse()
-
-        for round_n in round_nums:
-            subkey = self.__get_subkey(round_n)
-            left = np.bitwise_xor(left, _round_function(right, subkey))
-            if round_n != round_nums[len(round_nums) - 1]:
+        key_ints = self._preprocess_key(key)
+        self.__subkeys = _generate_subkeys(key_ints)
+
+    def __process_blocks(self, blocks: np.ndarray,
+                         is_encrypt: bool) -> np.ndarray:
+        """Process the input blocks' integers, one block per row
+        (works in both ways)."""
+        # Halves are copied once and then xored in place in every round.
+        chunk_middle = blocks.shape[1] // 2
+        left = blocks[:, :chunk_middle].copy()
+        right = blocks[:, chunk_middle:].copy()
+
+        subkeys = self.__subkeys if is_encrypt else self.__subkeys[::-1]
+
+        for round_i, subkey in enumerate(subkeys):
+            left ^= _round_function(right, subkey)
+            if round_i != len(subkeys) - 1:
                 left, right = right, left
 
-        return left.tolist() + right.tolist()
+        return np.hstack([left, right])
 
-    def _encrypt_block_ints(self, block_ints: List[int]) -> List[int]:
-        """Encrypt the text block's integers."""
-        return self.__process_block(block_ints, True)
+    def _encrypt_blocks_ints(self, blocks: np.ndarray) -> np.ndarray:
+        """Encrypt the text blocks' integers (one block per row)."""
+        return self.__process_blocks(blocks, True)
 
-    def _decrypt_block_ints(self, block_ints: List[int]) -> List[int]:
-        """Decrypt the cipher block's integers."""
-        return self.__process_block(block_ints, False)
+    def _decrypt_blocks_ints(self, blocks: np.ndarray) -> np.ndarray:
+        """Decrypt the cipher blocks' integers (one block per row)."""
+        return self.__process_blocks(blocks, False)
@@ -1,7 +1,9 @@
 from typing import List, Tuple
 
-from cipher.base import BlockCipher
-from utils import BYTE_BITS, bin_join, bin_split, rotl, mod_inv
+import numpy as np
+
+from cipher.base import BlockCipher, cache_key_schedule
+from utils import BYTE_BITS, bin_join, bin_split, rotl
 
 # Length of block in bits.
 BLOCK_BITS = 64
@@ -12,6 +14,9 @@ BLOCK_BYTES = BLOCK_BITS // BYTE_BITS
 # Length of subblock in bits.
 SUBBLOCK_BITS = 16
 
+# Big-endian subblock data type used to join block bytes into subblocks.
+SUBBLOCK_DTYPE = np.dtype('>u{0}'.format(SUBBLOCK_BITS // BYTE_BITS))
+
 # Length of key in bits.
 KEY_BITS = 128
 
@@ -39,10 +44,8 @@ RoundSubkeys = List[int]
 # Type alias for a list of all rounds' subkeys.
 BlockSubkeys = List[RoundSubkeys]
 
-
-def _add(x1, x2):
-    """Addition in the additive group (mod 2**16)."""
-    return (x1 + x2) % MOD
+# Type alias for an immutable tuple of all rounds' subkeys.
+FrozenSubkeys = Tuple[Tuple[int, ...], ...]
 
 
 def _add_inv(x):
@@ -51,49 +54,61 @@ def _add_inv(x):
 
 
 def _mul(x1, x2):
-    """Multiplication in the multiplicative group (mod 2**16 + 1)."""
-    if x1 == 0:
-        x1 = MOD
-    if x2 == 0:
-        x2 = MOD
+    """Multiplication in the multiplicative group (mod 2**16 + 1), where
+    0 stands for 2**16."""
+    return (x1 or MOD) * (x2 or MOD) % (MOD + 1) % MOD
 
-    return (x1 * x2) % (MOD + 1)
 
+def _get_mul_inv_table() -> np.ndarray:
+    """Compute multiplicative inverses of all elements (mod 2**16 + 1) at
+    once, as x ** (p - 2) by Fermat's little theorem (0 stays 0)."""
+    p = MOD + 1
+    table = np.ones(p, np.uint64)
+    base = np.arange(p, dtype=np.uint64)
 
-def _mul_inv(x):
-    """Multiplicative inverse in the multiplicative group (mod 2**16 + 1)"""
-    return mod_inv(x, MOD + 1)
+    exp = p - 2
+    while exp > 0:
+        if exp & 1:
+            table = table * base % p
+        base = base * base % p
+        exp >>= 1
+
+    return table
 
 
-def _ka_layer(x1: int, x2: int, x3: int, x4: int,
-              subkeys: RoundSubkeys) -> LayerOut:
-    """Key addition layer. One of components of a round transformation."""
-    k1, k2, k3, k4 = subkeys
+# Multiplicative inverses (mod 2**16 + 1) indexed by the element.
+MUL_INV = _get_mul_inv_table()
 
-    y1 = _mul(x1, k1)
-    y2 = _add(x2, k2)
-    y3 = _add(x3, k3)
-    y4 = _mul(x4, k4)
 
-    return y1, y2, y3, y4
+def _mul_inv(x):
+    """Multiplicative inverse in the multiplicative group (mod 2**16 + 1)"""
+    return int(MUL_INV[x])
 
 
-def _ma_layer(y1: int, y2: int, y3: int, y4: int,
-              subkeys: RoundSubkeys) -> LayerOut:
-    """Multiplication-addition layer. One of components of a round
-    transformation."""
-    k5, k6 = subkeys
+def _process_subblocks(x1: int, x2: int, x3: int, x4: int,
+                       subkeys: FrozenSubkeys) -> LayerOut:
+    """Process the subblocks with all rounds and the output transformation
+    (works in both ways)."""
+    for k1, k2, k3, k4, k5, k6 in subkeys[:ROUNDS_N]:
+        # Key addition layer.
+        y1 = _mul(x1, k1)
+        y2 = (x2 + k2) % MOD
+        y3 = (x3 + k3) % MOD
+        y4 = _mul(x4, k4)
 
-    a = _mul(y1 ^ y3, k5)
-    b = _mul(k6, _add(y2 ^ y4, a))
-    c = _add(b, a)
+        # Multiplication-addition layer.
+        a = _mul(y1 ^ y3, k5)
+        b = _mul(k6, ((y2 ^ y4) + a) % MOD)
+        c = (b + a) % MOD
 
-    x1 = y1 ^ b
-    x2 = y3 ^ b
-    x3 = y2 ^ c
-    x4 = y4 ^ c
+        x1 = y1 ^ b
+        x2 = y3 ^ b
+        x3 = y2 ^ c
+        x4 = y4 ^ c
 
-    return x1, x2, x3, x4
+    # Output transformation (key addition layer without the last swap).
+    k1, k2, k3, k4 = subkeys[ROUNDS_N]
+    return _mul(x1, k1), (x3 + k2) % MOD, (x2 + k3) % MOD, _mul(x4, k4)
 
 
 def _generate_subkeys(key_ints: List[int]) -> BlockSubkeys:
@@ -136,9 +151,20 @@ def _invert_subkeys(subkeys: BlockSubkeys) -> BlockSubkeys:
     return inv_subkeys
 
 
+@cache_key_schedule
+def _get_subkeys(key_bytes: bytes, is_encrypt: bool) -> FrozenSubkeys:
+    """Generate immutable subkeys for encryption or decryption."""
+    subkeys = _generate_subkeys(list(key_bytes))
+    if is_encrypt is False:
+        subkeys = _invert_subkeys(subkeys)
+    return tuple(map(tuple, subkeys))
+
+
 class IDEA(BlockCipher):
     """Class that encapsulates the IDEA cipher's logic."""
 
+    _key_schedule = staticmethod(_get_subkeys)
+
     def __init__(self) -> None:
         super().__init__(BLOCK_BYTES, KEY_BYTES)
         self.__subkeys = None
@@ -146,30 +172,22 @@ class IDEA(BlockCipher):
     def _set_key(self, key: str, is_encrypt: bool) -> None:
         """Validate and set the key."""
         key_ints = self._preprocess_key(key)
-        subkeys = _generate_subkeys(key_ints)
-        if is_encrypt is False:
-            subkeys = _invert_subkeys(subkeys)
-        self.__subkeys = subkeys
-
-    def __process_block(self, block_ints: List[int]) -> List[int]:
-        """Process the input block's integers (works in both ways)."""
-        block_bin = bin_join(block_ints, BYTE_BITS)
-        [x1, x2, x3, x4] = bin_split(block_bin, BLOCK_BITS, SUBBLOCK_BITS)
+        self.__subkeys = self._key_schedule(bytes(key_ints), is_encrypt)
 
-        for i in range(ROUNDS_N):
-            y1, y2, y3, y4 = _ka_layer(x1, x2, x3, x4, self.__subkeys[i][:4])
-            x1, x2, x3, x4 = _ma_layer(y1, y2, y3, y4, self.__subkeys[i][4:])
+    def __process_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """Process the input blocks' integers, one block per row
+        (works in both ways)."""
+        subblocks = blocks.view(SUBBLOCK_DTYPE).tolist()
 
-        y1, y2, y3, y4 = _ka_layer(x1, x3, x2, x4, self.__subkeys[ROUNDS_N])
-        output_bin = bin_join([y1, y2, y3, y4], SUBBLOCK_BITS)
-        output_ints = bin_split(output_bin, BLOCK_BITS, BYTE_BITS)
+        output_subblocks = [_process_subblocks(x1, x2, x3, x4, self.__subkeys)
+                            for x1, x2, x3, x4 in subblocks]
 
-        return output_ints
+        return np.array(output_subblocks, SUBBLOCK_DTYPE).view(np.uint8)
 
-    def _encrypt_block_ints(self, block_ints: List[int]) -> List[int]:
-        """Encrypt the text block's integers."""
-        return self.__process_block(block_ints)
+    def _encrypt_blocks_ints(self, blocks: np.ndarray) -> np.ndarray:
+        """Encrypt the text blocks' integers (one block per row)."""
+        return self.__process_blocks(blocks)
 
-    def _decrypt_block_ints(self, block_ints: List[int]) -> List[int]:
-        """Decrypt the cipher block's integers."""
-        return self.__process_block(block_ints)
+    def _decrypt_blocks_ints(self, blocks: np.ndarray) -> np.ndarray:
+        """Decrypt the cipher blocks' integers (one block per row)."""
+        return self.__process_blocks(blocks)
@@ -1,8 +1,10 @@
 import math
 from typing import List
 
-from cipher.base import BlockCipher
-from utils import BYTE_BITS, bin_join, bin_split, rotl, rotr, odd
+import numpy as np
+
+from cipher.base import BlockCipher, cache_key_schedule
+from utils import BYTE_BITS, odd
 from validators import value_in_range
 
 # Length of word in bits.
@@ -11,6 +13,9 @@ W = 32
 # Length of word in bytes.
 U = W // BYTE_BITS
 
+# Big-endian word data type used to join block bytes into registers.
+WORD_DTYPE = np.dtype('>u{0}'.format(U))
+
 # Decimal logarithm of W.
 LG_W = round(math.log(W, 10))
 
@@ -45,6 +50,34 @@ Q_W = odd((F - 1) * MOD)
 P_W = odd((E - 2) * MOD)
 
 
+def _rotl_word(word: int, num: int) -> int:
+    """Perform left circular shift of a word by num."""
+    num &= W - 1
+    return ((word << num) | (word >> (W - num))) & (MOD - 1)
+
+
+def _rotl_words(words: np.ndarray, nums: np.ndarray) -> np.ndarray:
+    """Perform left circular shift of each word by the respective num."""
+    nums = nums & (W - 1)
+    return (words << nums) | (words >> ((W - nums) & (W - 1)))
+
+
+def _rotr_words(words: np.ndarray, nums: np.ndarray) -> np.ndarray:
+    """Perform right circular shift of each word by the respective num."""
+    nums = nums & (W - 1)
+    return (words >> nums) | (words << ((W - nums) & (W - 1)))
+
+
+def _blocks_to_regs(blocks: np.ndarray) -> np.ndarray:
+    """Join individual bytes of each block into 4 registers."""
+    return blocks.view(WORD_DTYPE).astype(np.uint32).T
+
+
+def _regs_to_blocks(regs: List[np.ndarray]) -> np.ndarray:
+    """Split 4 registers of each block into individual bytes."""
+    return np.stack(regs, axis=1).astype(WORD_DTYPE).view(np.uint8)
+
+
 def _key_expansion(key_ints: List[int]) -> List[int]:
     """Generate round subkey words (key expansion algorithm)."""
     b = len(key_ints)
@@ -69,17 +102,27 @@ def _key_expansion(key_ints: List[int]) -> List[int]:
 
     v = 3 * max(c, t)
     for k in range(1, v):
-        a = s[i] = rotl((s[i] + a + b) % MOD, 3, W)
-        b = l[j] = rotl((l[j] + a + b) % MOD, a + b, W)
+        a = s[i] = _rotl_word((s[i] + a + b) % MOD, 3)
+        b = l[j] = _rotl_word((l[j] + a + b) % MOD, a + b)
         i = (i + 1) % t
         j = (j + 1) % c
 
     return s
 
 
+@cache_key_schedule
+def _get_subkey_words(key_bytes: bytes) -> np.ndarray:
+    """Get read-only round subkey words array."""
+    s = np.array(_key_expansion(list(key_bytes)), np.uint32)
+    s.flags.writeable = False
+    return s
+
+
 class RC6(BlockCipher):
     """Class that encapsulates the RC6 cipher's logic."""
 
+    _key_schedule = staticmethod(_get_subkey_words)
+
     def __init__(self, key_bytes: int = MAX_KEY_BYTES) -> None:
         self.__validate_init_params(key_bytes)
         super().__init__(BLOCK_BYTES, key_bytes)
@@ -93,60 +136,42 @@ class RC6(BlockCipher):
     def _set_key(self, key: str, is_encrypt: bool) -> None:
         """Validate and set the key."""
         key_ints = self._preprocess_key(key)
-        self.__s = _key_expansion(key_ints)
+        self.__s = self._key_schedule(bytes(key_ints))
 
-    def _encrypt_block_ints(self, block_ints: List[int]) -> List[int]:
-        """Encrypt the text block's integers."""
+    def _encrypt_blocks_ints(self, blocks: np.ndarray) -> np.ndarray:
+        """Encrypt the text blocks' integers (one block per row)."""
         s = self.__s
 
-        # Join individual block bytes into 4 registers.
-        regs = []
-        for i in range(0, len(block_ints), 4):
-            reg = bin_join(block_ints[i:i + 4], BYTE_BITS)
-            regs.append(reg)
-
-        [a, b, c, d] = regs
-
-        b = (b + s[0]) % MOD
-        d = (d + s[1]) % MOD
-        for i in range(1, R + 1):
-            t = rotl((b * (2 * b + 1)) % MOD, LG_W, W)
-            u = rotl((d * (2 * d + 1)) % MOD, LG_W, W)
-            a = (rotl(a ^ t, u, W) + s[2 * i]) % MOD
-            c = (rotl(c ^ u, t, W) + s[2 * i + 1]) % MOD
-            (a, b, c, d) = (b, c, d, a)
-        a = (a + s[2 * R + 2]) % MOD
-        c = (c + s[2 * R + 3]) % MOD
+        [a, b, c, d] = _blocks_to_regs(blocks)
 
-        cipher_int = bin_join([a, b, c, d], W)
-        cipher_ints = bin_split(cipher_int, BLOCK_BITS, BYTE_BITS)
+        b = b + s[0]
+        d = d + s[1]
+        for s_a, s_c in s[2:2 * R + 2].reshape(R, 2):
+            t = _rotl_words(b * (2 * b + 1), LG_W)
+            u = _rotl_words(d * (2 * d + 1), LG_W)
+            a = _rotl_words(a ^ t, u) + s_a
+            c = _rotl_words(c ^ u, t) + s_c
+            (a, b, c, d) = (b, c, d, a)
+        a = a + s[2 * R + 2]
+        c = c + s[2 * R + 3]
 
-        return cipher_ints
+        return _regs_to_blocks([a, b, c, d])
 
-    def _decrypt_block_ints(self, block_ints: List[int]) -> List[int]:
-        """Decrypt the cipher block's integers."""
+    def _decrypt_blocks_ints(self, blocks: np.ndarray) -> np.ndarray:
+        """Decrypt the cipher blocks' integers (one block per row)."""
         s = self.__s
 
-        # Join individual block bytes into 4 registers.
-        regs = []
-        for i in range(0, len(block_ints), 4):
-            reg = bin_join(block_ints[i:i + 4], BYTE_BITS)
-            regs.append(reg)
-
-        [a, b, c, d] = regs
+        [a, b, c, d] = _blocks_to_regs(blocks)
 
-        c = (c - s[2 * R + 3]) % MOD
-        a = (a - s[2 * R + 2]) % MOD
-        for j in range(R, 0, -1):
+        c = c - s[2 * R + 3]
+        a = a - s[2 * R + 2]
+        for s_a, s_c in s[2:2 * R + 2].reshape(R, 2)[::-1]:
             (a, b, c, d) = (d, a, b, c)
-            u = rotl((d * (2 * d + 1)) % MOD, LG_W, W)
-            t = rotl((b * (2 * b + 1)) % MOD, LG_W, W)
-            c = (rotr((c - s[2 * j + 1]) % MOD, t, W) ^ u)
-            a = (rotr((a - s[2 * j]) % MOD, u, W) ^ t)
-        d = (d - s[1]) % MOD
-        b = (b - s[0]) % MOD
-
-        text_int = bin_join([a, b, c, d], W)
-        text_ints = bin_split(text_int, BLOCK_BITS, BYTE_BITS)
-
-        return text_ints
+            u = _rotl_words(d * (2 * d + 1), LG_W)
+            t = _rotl_words(b * (2 * b + 1), LG_W)
+            c = _rotr_words(c - s_c, t) ^ u
+            a = _rotr_words(a - s_a, u) ^ t
+        d = d - s[1]
+        b = b - s[0]
+
+        return _regs_to_blocks([a, b, c, d])
@@ -22,6 +22,9 @@ N_B = 4
 # Length of key in words. Possible values: 4, 6, 8.
 N_K = 4
 
+# Possible values of N_B and N_K.
+N_VALUES = frozenset({4, 6, 8})
+
 # Substitution box (lookup table).
 SBOX = [
     [0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5, 0x30, 0x01, 0x67, 0x2b, 0xfe, 0xd7, 0xab, 0x76],
@@ -150,10 +153,8 @@ class Rijndael(BlockCipher):
     @staticmethod
     def __validate_init_params(n_b: int, n_k: int) -> None:
         """Validate initialization parameters."""
-        allowed_values = [4, 6, 8]
-
-        value_in_list("N_B", n_b, allowed_values)
-        value_in_list("N_K", n_k, allowed_values)
+        value_in_list("N_B", n_b, N_VALUES)
+        value_in_list("N_K", n_k, N_VALUES)
 
     def __key_expansion(self, key_ints: List[int]) -> np.ndarray:
         """Perform a derivation of round keys from the main key
@@ -6,7 +6,7 @@ import numpy as np
 
 from cipher.base import Cipher
 from errors import SquareNotValidError, CharNotAllowedError, InputLengthError
-from utils import nearest_sqrt
+from utils import IO_CHUNK_BYTES, nearest_sqrt, str_to_codes, codes_to_str
 
 # List of allowed marks in the chars square.
 ALLOWED_MARKS = ['!', '"', '#', '$', '%', '&', "'", '(', ')', '*',
@@ -20,9 +20,6 @@ ALLOWED_CHARS = list(string.ascii_letters + string.digits) + ALLOWED_MARKS
 # Length of chunk to process in bytes.
 CHUNK_BYTES = 2
 
-# Type alias for a tuple of char's coordinates in a chars square.
-Coords = Tuple[int, int]
-
 
 def _get_random_chars_square() -> np.ndarray:
     """Generate random square with ASCII chars."""
@@ -40,37 +37,65 @@ class Square:
             data = _get_random_chars_square()
         self.data = data
 
-    def find_char(self, char: str) -> Coords:
-        """Find char's coordinates."""
-        coords = np.concatenate(np.where(self.data == char))
-        if len(coords) == 0:
-            raise CharNotAllowedError(char)
-
-        return tuple(coords.tolist())
-
-    def shift_vertical(self, coords: Coords, is_increasing: bool) -> Coords:
-        """Get vertically shifted coordinates of the char."""
+        # Built on first use, so that invalid data is reported by the
+        # cipher's validation first.
+        self.__codes = None
+        self.__coords_table = None
+
+    def __build_tables(self) -> None:
+        """Build the lookup tables of chars' code points and coordinates."""
+        codes = str_to_codes(''.join(self.data.ravel()))
+        self.__codes = codes.reshape(self.data.shape)
+
+        # Lookup table of chars' coordinates indexed by chars' code points
+        # (the first occurrence of a repeated char is used).
+        unique_codes, first_i = np.unique(codes, return_index=True)
+        self.__coords_table = np.full((codes.max() + 1, 2), -1)
+        self.__coords_table[unique_codes] = np.stack(
+            np.unravel_index(first_i, self.data.shape), axis=1)
+
+    def find_chars(self, codes: np.ndarray) -> np.ndarray:
+        """Find coordinates of the chars given by their code points (one
+        pair of coordinates per row)."""
+        if self.__coords_table is None:
+            self.__build_tables()
+
+        coords = np.full((len(codes), 2), -1)
+        in_table = codes < len(self.__coords_table)
+        coords[in_table] = self.__coords_table[codes[in_table]]
+
+        not_found = np.flatnonzero(coords[:, 0] == -1)
+        if len(not_found) > 0:
+            raise CharNotAllowedError(int(codes[not_found[0]]))
+
+        return coords
+
+    def get_chars(self, coords: np.ndarray) -> np.ndarray:
+        """Get code points of the chars by their coordinates."""
+        if self.__codes is None:
+            self.__build_tables()
+
+        return self.__codes[coords[:, 0], coords[:, 1]]
+
+    def shift_vertical(self, coords: np.ndarray,
+                       is_increasing: bool) -> np.ndarray:
+        """Get vertically shifted coordinates of the chars."""
         max_coord = self.data.shape[0]
+        shift = 1 if is_increasing else -1
 
-        if is_increasing:
-            return (coords[0] + 1) % max_coord, coords[1]
-
-        if coords[0] == 0:
-            coords = (max_coord, coords[1])
+        coords = coords.copy()
+        coords[:, 0] = (coords[:, 0] + shift) % max_coord
+        return coords
 
-        return coords[0] - 1, coords[1]
-
-    def shift_horizontal(self, coords: Coords, is_increasing: bool) -> Coords:
-        """Get horizontally shifted coordinates of the char."""
+    def shift_horizontal(self, coords: np.ndarray,
+                         is_increasing: bool) -> np.ndarray:
+        """Get horizontally shifted coordinates of the chars."""
         max_coord = self.data.shape[1]
+        shift = 1 if is_increasing else -1
 
-        if is_increasing:
-            return coords[0], (coords[1] + 1) % max_coord
-
-        if coords[1] == 0:
-            coords = (coords[0], max_coord)
-
-        return coords[0], coords[1] - 1
+        coords = coords.copy()
+        coords[:, 1] = (coords[:, 1] + shift) % max_coord
+        return coords
 
 
 # Type alias for a tuple of two chars squares.
@@ -121,38 +146,40 @@ class TwoSquare(Cipher):
         self.__squares = squares
 
     def __process_chunk(self, chunk: str, is_encrypt: bool) -> str:
-        """Get opposite chars in chars squares (works in both ways)."""
+        """Get opposite chars in chars squares for each pair of chars
+        (works in both ways)."""
         squares = self.__squares
 
+        pairs = str_to_codes(chunk).reshape(-1, CHUNK_BYTES)
         coords = (
-            squares[0].find_char(chunk[0]),
-            squares[1].find_char(chunk[1]),
+            squares[0].find_chars(pairs[:, 0]),
+            squares[1].find_chars(pairs[:, 1])
+        )
+
+        same_row = coords[0][:, 0] == coords[1][:, 0]
+        same_col = ~same_row & (coords[0][:, 1] == coords[1][:, 1])
+
+        # Rectangle corners, overwritten below for the same row or column.
+        new_coords = (
+            np.stack([coords[1][:, 0], coords[0][:, 1]], axis=1),
+            np.stack([coords[0][:, 0], coords[1][:, 1]], axis=1)
         )
 
-        if coords[0][0] == coords[1][0]:
-            # Same row.
-            new_coords = (
-                squares[0].shift_horizontal(coords[0], is_encrypt),
-                squares[1].shift_horizontal(coords[1], is_encrypt)
-            )
-        elif coords[0][1] == coords[1][1]:
-            # Same column.
-            new_coords = (
-                squares[0].shift_vertical(coords[0], is_encrypt),
-                squares[1].shift_vertical(coords[1], is_encrypt)
-            )
-        else:
-            new_coords = (
-                (coords[1][0], coords[0][1]),
-                (coords[0][0], coords[1][1])
-            )
-
-        return squares[0].data[new_coords[0]] + squares[1].data[new_coords[1]]
+        for square, old, new in zip(squares, coords, new_coords):
+            new[same_row] = square.shift_horizontal(old[same_row], is_encrypt)
+            new[same_col] = square.shift_vertical(old[same_col], is_encrypt)
+
+        new_pairs = np.stack([
+            squares[0].get_chars(new_coords[0]),
+            squares[1].get_chars(new_coords[1])
+        ], axis=1)
+
+        return codes_to_str(new_pairs.ravel())
 
     def __encrypt_chunk(self, text_chunk: str) -> str:
         """Encrypt the text chunk."""
-        if len(text_chunk) < CHUNK_BYTES:
-            text_chunk += '\x01' * (CHUNK_BYTES - len(text_chunk))
+        padding_length = -len(text_chunk) % CHUNK_BYTES
+        text_chunk += '\x01' * padding_length
         return self.__process_chunk(text_chunk, True)
 
     def encrypt(self, text: TextIO, squares: SquaresTuple,
@@ -161,7 +188,7 @@ class TwoSquare(Cipher):
         self.__set_squares(squares)
 
         while True:
-            text_chunk = text.read(CHUNK_BYTES)
+            text_chunk = text.read(IO_CHUNK_BYTES)
             if text_chunk == '':
                 break
 
@@ -171,22 +198,15 @@ class TwoSquare(Cipher):
 
     def __decrypt_chunk(self, cipher_chunk: str) -> str:
         """Decrypt the cipher chunk."""
-        if len(cipher_chunk) < CHUNK_BYTES:
+        if len(cipher_chunk) % CHUNK_BYTES != 0:
             raise InputLengthError(CHUNK_BYTES)
 
-        text_chunk = self.__process_chunk(cipher_chunk, False)
-        return text_chunk.rstrip('\x01')
+        return self.__process_chunk(cipher_chunk, False)
 
     def decrypt(self, cipher: TextIO, squares: SquaresTuple,
                 text: TextIO) -> None:
         """Decrypt the cipher using chars squares."""
         self.__set_squares(squares)
 
-        while True:
-            cipher_chunk = cipher.read(CHUNK_BYTES)
-            if cipher_chunk == '':
-                break
-
-            text_chunk = self.__decrypt_chunk(cipher_chunk)
-
-            text.write(text_chunk)
+        self._decrypt_padded(cipher, text, IO_CHUNK_BYTES,
+                             self.__decrypt_chunk)
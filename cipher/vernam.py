@@ -1,56 +1,62 @@
-import random
-from typing import TextIO, Generator
+import os
+from typing import TextIO
+
+import numpy as np
 
 from cipher.base import Cipher
-from utils import HEX_LENGTH, int_to_hex, hex_to_int
-from validators import char_int_allowed
+from utils import HEX_LENGTH, IO_CHUNK_BYTES, str_to_codes, hex_str_to_bytes
 
 
-def _random_int_generator() -> Generator[int, None, None]:
-    """Generator function which returns random integers."""
-    while True:
-        yield random.randint(0, 255)
+def _get_random_ints(length: int) -> np.ndarray:
+    """Generate an array of cryptographically secure random byte
+    integers."""
+    return np.frombuffer(os.urandom(length), np.uint8)
 
 
 class Vernam(Cipher):
-    """Class that encapsulates the Vernam cipher's logic."""
-
-    def __init__(self) -> None:
-        self.__key_int_gen = _random_int_generator()
+    """Class that encapsulates the Vernam cipher's logic. The key is drawn
+    from the OS's cryptographically secure random source (os.urandom), so
+    it cannot be predicted from previously generated keys."""
 
     def encrypt(self, text: TextIO, key_filename: str, cipher: TextIO) -> None:
         """Encrypt the text and save generated key to the file."""
-        with open(key_filename, 'w') as key_file:
+        with open(key_filename, 'wb') as key_file:
             while True:
-                text_char = text.read(1)
-                if text_char == '':
+                text_chunk = text.read(IO_CHUNK_BYTES)
+                if text_chunk == '':
                     break
 
-                text_int = ord(text_char)
-                char_int_allowed(text_int)
+                text_codes = str_to_codes(text_chunk)
+                self._validate_input_bulk(text_codes)
+                text_ints = text_codes.astype(np.uint8)
 
-                key_int = next(self.__key_int_gen)
+                key_ints = _get_random_ints(len(text_ints))
 
-                cipher_int = text_int ^ key_int
+                cipher_ints = np.bitwise_xor(text_ints, key_ints)
 
-                key_file.write(int_to_hex(key_int))
-                cipher.write(int_to_hex(cipher_int))
+                key_file.write(key_ints.tobytes())
+                cipher.write(cipher_ints.tobytes().hex().upper())
 
     def decrypt(self, cipher: TextIO, key_filename: str, text: TextIO) -> None:
         """Decrypt the cipher using the key from the file."""
-        with open(key_filename, 'r') as key_file:
+        with open(key_filename, 'rb') as key_file:
             while True:
-                cipher_hex = cipher.read(HEX_LENGTH)
-                key_hex = key_file.read(HEX_LENGTH)
-                if cipher_hex == '' or key_hex == '':
+                cipher_chunk = cipher.read(IO_CHUNK_BYTES * HEX_LENGTH)
+                if cipher_chunk == '':
+                    break
+
+                cipher_bytes = hex_str_to_bytes(cipher_chunk)
+
+                key_bytes = key_file.read(len(cipher_bytes))
+                if key_bytes == b'':
                     break
 
-                cipher_int = hex_to_int(cipher_hex)
-                char_int_allowed(cipher_int)
+                # Only the part covered by both the cipher and the key.
+                cipher_bytes = cipher_bytes[:len(key_bytes)]
 
-                key_int = hex_to_int(key_hex)
-                char_int_allowed(key_int)
+                cipher_ints = np.frombuffer(cipher_bytes, np.uint8)
+                key_ints = np.frombuffer(key_bytes, np.uint8)
 
-                text_int = cipher_int ^ key_int
+                text_ints = np.bitwise_xor(cipher_ints, key_ints)
 
-                text.write(chr(text_int))
+                text.write(text_ints.tobytes().decode('latin-1'))
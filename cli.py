@@ -1,3 +1,4 @@
+import sys
 from io import StringIO
 from typing import TextIO
 
@@ -20,6 +21,26 @@ from errors import (
     ValueNotInListError, ValueNotInRangeError
 )
 
+# Errors which are reported to the user instead of a traceback.
+USER_ERRORS = (
+    MaskNotValidError, SquareNotValidError, InputLengthError,
+    EmptyKeyError, CharNotAllowedError, HexNotValidError,
+    ValueNotInListError, ValueNotInRangeError
+)
+
+
+class CliContext:
+    """Class that encapsulates the state shared by the commands."""
+
+    __slots__ = ('is_encrypt', 'input_stream', 'output_stream', 'to_stdout')
+
+    def __init__(self, is_encrypt: bool, input_stream: TextIO,
+                 output_stream: TextIO, to_stdout: bool) -> None:
+        self.is_encrypt = is_encrypt
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.to_stdout = to_stdout
+
 
 @click.group()
 @click.option(
@@ -48,23 +69,22 @@ def cli(ctx: click.core.Context, encrypt: bool, input_file: TextIO,
         output_file: TextIO) -> None:
     """Allows to encrypt or decrypt plain text or text files with
     various ciphers."""
-    ctx.ensure_object(dict)
-
-    ctx.obj['is_encrypt'] = encrypt
-
     if input_file is None:
         input_text = click.prompt("Enter input")
-        ctx.obj['input_stream'] = StringIO(input_text)
+        input_stream = StringIO(input_text)
     else:
-        ctx.obj['input_stream'] = input_file
+        input_stream = input_file
         print("Input loaded from {0}".format(input_file.name))
 
+    # Without the output file the output is streamed straight to stdout,
+    # instead of being accumulated in memory.
     if output_file is None:
-        ctx.obj['output_stream'] = StringIO()
+        output_stream = sys.stdout
     else:
-        ctx.obj['output_stream'] = output_file
+        output_stream = output_file
 
-    ctx.obj['to_stdout'] = output_file is None
+    ctx.obj = CliContext(encrypt, input_stream, output_stream,
+                         output_file is None)
 
 
 @cli.command(short_help="Cardan grille")
@@ -73,16 +93,16 @@ def cli(ctx: click.core.Context, encrypt: bool, input_file: TextIO,
     type=click.Path(exists=True)
 )
 @click.pass_obj
-def cardan(obj: dict, mask_filename: str) -> None:
+def cardan(obj: CliContext, mask_filename: str) -> None:
     """Encrypt/decrypt text with Cardan grille using the mask from
     MASK_FILENAME."""
     cipher = Cardan()
     mask = load_mask(mask_filename)
     print("Mask loaded from {0}".format(mask_filename))
 
-    action = cipher.encrypt if obj['is_encrypt'] is True else cipher.decrypt
+    action = cipher.encrypt if obj.is_encrypt is True else cipher.decrypt
 
-    action(obj['input_stream'], mask, obj['output_stream'])
+    action(obj.input_stream, mask, obj.output_stream)
 
 
 @cli.command(short_help="Two-square cipher")
@@ -91,12 +111,12 @@ def cardan(obj: dict, mask_filename: str) -> None:
     type=click.Path(exists=True)
 )
 @click.pass_obj
-def two_square(obj: dict, squares_filename: str) -> None:
+def two_square(obj: CliContext, squares_filename: str) -> None:
     """Encrypt/decrypt text with two-square cipher using the squares from
     SQUARES_FILENAME."""
     cipher = TwoSquare()
 
-    if obj['is_encrypt'] is True:
+    if obj.is_encrypt is True:
         squares = Square(), Square()
         save_squares(squares_filename, squares)
         print("Squares saved to {0}".format(squares_filename))
@@ -106,7 +126,7 @@ def two_square(obj: dict, squares_filename: str) -> None:
         print("Squares loaded from {0}".format(squares_filename))
         action = cipher.decrypt
 
-    action(obj['input_stream'], squares, obj['output_stream'])
+    action(obj.input_stream, squares, obj.output_stream)
 
 
 @cli.command(short_help="Vernam cipher")
@@ -115,31 +135,29 @@ def two_square(obj: dict, squares_filename: str) -> None:
     type=click.Path(exists=True)
 )
 @click.pass_obj
-def vernam(obj: dict, key_filename: str) -> None:
+def vernam(obj: CliContext, key_filename: str) -> None:
     """Encrypt/decrypt text with Vernam cipher using the key from
     KEY_FILENAME."""
     cipher = Vernam()
 
-    if obj['is_encrypt'] is True:
+    if obj.is_encrypt is True:
         action = cipher.encrypt
-        key_message = "Key saved to {0}".format(key_filename)
+        key_message = "Key will be saved to {0}".format(key_filename)
 
     else:
         action = cipher.decrypt
         key_message = "Key loaded from {0}".format(key_filename)
 
-    action(obj['input_stream'], key_filename, obj['output_stream'])
+    # Printed before the action, since the output may go to stdout.
     print(key_message)
+    action(obj.input_stream, key_filename, obj.output_stream)
 
 
-def key_cipher_command(obj: dict, key_file: TextIO,
+def key_cipher_command(obj: CliContext, key_file: TextIO,
                        cipher: KeyCipher) -> None:
     """Encrypt/decrypt text with given cipher using the key from
     KEY_FILE. If KEY_FILE is not provided, a prompt will appear."""
-    if obj['is_encrypt'] is True:
-        action = cipher.encrypt
-    else:
-        action = cipher.decrypt
+    action = cipher.encrypt if obj.is_encrypt is True else cipher.decrypt
 
     if key_file is None:
         key = click.prompt("Enter key")
@@ -147,7 +165,7 @@ def key_cipher_command(obj: dict, key_file: TextIO,
         key = key_file.read(cipher.key_bytes)
         print("Key loaded from {0}".format(key_file.name))
 
-    action(obj['input_stream'], key, obj['output_stream'])
+    action(obj.input_stream, key, obj.output_stream)
 
 
 @cli.command(short_help="Feistel network")
@@ -157,7 +175,7 @@ def key_cipher_command(obj: dict, key_file: TextIO,
     required=False
 )
 @click.pass_obj
-def feistel(obj: dict, key_file: TextIO) -> None:
+def feistel(obj: CliContext, key_file: TextIO) -> None:
     """Encrypt/decrypt text with Feistel network using the key from
     KEY_FILE. If KEY_FILE is not provided, a prompt will appear."""
     cipher = Feistel()
@@ -171,7 +189,7 @@ def feistel(obj: dict, key_file: TextIO) -> None:
     required=False
 )
 @click.pass_obj
-def rijndael(obj: dict, key_file: TextIO) -> None:
+def rijndael(obj: CliContext, key_file: TextIO) -> None:
     """Encrypt/decrypt text with Rijndael cipher using the key from
     KEY_FILE. If KEY_FILE is not provided, a prompt will appear."""
     cipher = Rijndael()
@@ -185,7 +203,7 @@ def rijndael(obj: dict, key_file: TextIO) -> None:
     required=False
 )
 @click.pass_obj
-def arc4(obj: dict, key_file: TextIO) -> None:
+def arc4(obj: CliContext, key_file: TextIO) -> None:
     """Encrypt/decrypt text with ARC4 cipher using the key from
     KEY_FILE. If KEY_FILE is not provided, a prompt will appear."""
     cipher = ARC4()
@@ -199,7 +217,7 @@ def arc4(obj: dict, key_file: TextIO) -> None:
     required=False
 )
 @click.pass_obj
-def rc6(obj: dict, key_file: TextIO) -> None:
+def rc6(obj: CliContext, key_file: TextIO) -> None:
     """Encrypt/decrypt text with RC6 cipher using the key from
     KEY_FILE. If KEY_FILE is not provided, a prompt will appear."""
     cipher = RC6()
@@ -213,7 +231,7 @@ def rc6(obj: dict, key_file: TextIO) -> None:
     required=False
 )
 @click.pass_obj
-def blowfish(obj: dict, key_file: TextIO) -> None:
+def blowfish(obj: CliContext, key_file: TextIO) -> None:
     """Encrypt/decrypt text with Blowfish cipher using the key from
     KEY_FILE. If KEY_FILE is not provided, a prompt will appear."""
     cipher = Blowfish()
@@ -227,7 +245,7 @@ def blowfish(obj: dict, key_file: TextIO) -> None:
     required=False
 )
 @click.pass_obj
-def idea(obj: dict, key_file: TextIO) -> None:
+def idea(obj: CliContext, key_file: TextIO) -> None:
     """Encrypt/decrypt text with IDEA cipher using the key from
     KEY_FILE. If KEY_FILE is not provided, a prompt will appear."""
     cipher = IDEA()
@@ -238,10 +256,11 @@ def idea(obj: dict, key_file: TextIO) -> None:
 @click.pass_obj
 def print_output(obj, *args, **kwargs):
     """Print output after the end of command execution"""
-    if obj['to_stdout'] is True:
-        print("Output:", obj['output_stream'].getvalue())
+    if obj.to_stdout is True:
+        # Terminate the output streamed to stdout.
+        print()
     else:
-        print("Output saved to {0}".format(obj['output_stream'].name))
+        print("Output saved to {0}".format(obj.output_stream.name))
 
 
 @cli.resultcallback()
@@ -253,10 +272,8 @@ def print_success_message(result, encrypt, *args, **kwargs):
 
 def main():
     try:
-        cli(obj={})
-    except (MaskNotValidError, SquareNotValidError, InputLengthError,
-            EmptyKeyError, CharNotAllowedError, HexNotValidError,
-            ValueNotInListError, ValueNotInRangeError) as e:
+        cli()
+    except USER_ERRORS as e:
         print("Error:", e)
 
 
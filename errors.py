@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, Collection
 
 
 class MaskNotValidError(Exception):
@@ -35,8 +35,12 @@ class EmptyKeyError(Exception):
 class CharNotAllowedError(Exception):
     """Raised when the char is not allowed for input."""
 
-    def __init__(self, char: str) -> None:
-        self.char = char
+    def __init__(self, char_int: int) -> None:
+        self.char_int = char_int
+
+    @property
+    def char(self) -> str:
+        return chr(self.char_int)
 
     def __str__(self):
         return "Char '{0}' is not allowed".format(self.char)
@@ -55,14 +59,15 @@ class HexNotValidError(Exception):
 class ValueNotInListError(Exception):
     """Raised if the value is not in the list of allowed values."""
 
-    def __init__(self, name: str, value: Any, allowed: List[Any]) -> None:
+    def __init__(self, name: str, value: Any,
+                 allowed: Collection[Any]) -> None:
         self.name = name
         self.value = value
         self.allowed = allowed
 
     def __str__(self):
         return "{0} value ({1}) is not allowed. Allowed values: {2}".format(
-            self.name, self.value, self.allowed)
+            self.name, self.value, sorted(self.allowed))
 
 
 class ValueNotInRangeError(Exception):
@@ -1,4 +1,5 @@
 import math
+import string
 from typing import List
 
 import numpy as np
@@ -11,6 +12,12 @@ BYTE_BITS = 8
 # Length of hex which represents an ASCII char.
 HEX_LENGTH = 2
 
+# Chars allowed in a hexadecimal.
+HEX_DIGITS = frozenset(string.hexdigits)
+
+# Number of bytes read from the input at once.
+IO_CHUNK_BYTES = 2 ** 16
+
 
 def add_padding(text_ints: List[int], req_length: int) -> List[int]:
     """Add padding using the padding method 2."""
@@ -27,12 +34,36 @@ def remove_padding(text: str) -> str:
 
 def ints_to_chars(nums: List[int]) -> List[str]:
     """Convert a list of integers into a list of chars."""
+    # bytes() of an array would copy its memory instead of its values.
+    if isinstance(nums, list):
+        try:
+            return list(bytes(nums).decode('latin-1'))
+        except ValueError:
+            # Integers outside the byte range are converted one by one.
+            pass
+
     return list(map(chr, nums))
 
 
 def chars_to_ints(chars: str) -> List[int]:
     """Convert a list of chars into a list of integers."""
-    return list(map(ord, chars))
+    try:
+        return list(chars.encode('latin-1'))
+    except UnicodeEncodeError:
+        # Chars outside the byte range are left for the validators.
+        return list(map(ord, chars))
+
+
+def str_to_codes(string: str) -> np.ndarray:
+    """Convert a string into an array of its chars' code points."""
+    return np.frombuffer(string.encode('utf-32-le', 'surrogatepass'),
+                         np.uint32)
+
+
+def codes_to_str(codes: np.ndarray) -> str:
+    """Convert an array of chars' code points into a string."""
+    return codes.astype(np.uint32).tobytes().decode('utf-32-le',
+                                                     'surrogatepass')
 
 
 def int_to_hex(num: int) -> str:
@@ -58,6 +89,24 @@ def hexes_to_ints(hexes: List[str]) -> List[int]:
     return list(map(hex_to_int, hexes))
 
 
+def hex_str_to_bytes(hex_str: str) -> bytes:
+    """Convert a hex string into bytes."""
+    try:
+        hex_bytes = bytes.fromhex(hex_str)
+    except ValueError:
+        hex_bytes = b''
+
+    # bytes.fromhex() skips whitespace, so the length is checked as well.
+    if len(hex_bytes) * HEX_LENGTH == len(hex_str):
+        return hex_bytes
+
+    for i in range(0, len(hex_str), HEX_LENGTH):
+        hex = hex_str[i:i + HEX_LENGTH]
+        if len(hex) != HEX_LENGTH or not set(hex) <= HEX_DIGITS:
+            raise HexNotValidError(hex)
+    raise HexNotValidError(hex_str)
+
+
 def hex_str_to_ints(hex_str: str, width: int) -> List[int]:
     """Convert a hex string into a list of integers."""
     hexes = [hex_str[i:i + width] for i in range(0, len(hex_str), width)]
@@ -67,15 +116,13 @@ def hex_str_to_ints(hex_str: str, width: int) -> List[int]:
 def rotl_arr(array: np.ndarray, num: int) -> np.ndarray:
     """Perform left circular shift of an array by num."""
     num = num % len(array)
-    array = array.tolist()
-    return np.array(array[num:] + array[:num])
+    return np.concatenate((array[num:], array[:num]))
 
 
 def rotr_arr(array: np.ndarray, num: int) -> np.ndarray:
     """Perform right circular shift of an array by num."""
     num = num % len(array)
-    array = array.tolist()
-    return np.array(array[-num:] + array[:-num])
+    return np.concatenate((array[-num:], array[:-num]))
 
 
 def bin_slice(value: int, start: int, end: int, width: int) -> int:
@@ -87,6 +134,14 @@ def bin_slice(value: int, start: int, end: int, width: int) -> int:
 
 def bin_join(values: List[int], width: int) -> int:
     """Join bits of all integers."""
+    # bytes() of an array would copy its memory instead of its values.
+    if width == BYTE_BITS and isinstance(values, list):
+        try:
+            return int.from_bytes(bytes(values), 'big')
+        except ValueError:
+            # Values wider than a byte are joined bit by bit below.
+            pass
+
     num = 0
     for value in values:
         num = (num << width) | value
@@ -95,6 +150,13 @@ def bin_join(values: List[int], width: int) -> int:
 
 def bin_split(value: int, old_width: int, new_width: int) -> List[int]:
     """Split bits of an integer into a list of integers."""
+    if new_width % BYTE_BITS == 0 and old_width % new_width == 0:
+        value = value & ((1 << old_width) - 1)
+        value_bytes = value.to_bytes(old_width // BYTE_BITS, 'big')
+        step = new_width // BYTE_BITS
+        return [int.from_bytes(value_bytes[i:i + step], 'big')
+                for i in range(0, len(value_bytes), step)]
+
     nums = []
     for i in range(old_width // new_width):
         num = bin_slice(value, i * new_width, (i + 1) * new_width, old_width)
@@ -106,17 +168,17 @@ def bin_split(value: int, old_width: int, new_width: int) -> List[int]:
 def rotl(value: int, num: int, width: int) -> int:
     """Perform left circular shift of an integer."""
     num = num % width
-    l_slice = bin_slice(value, 0, num, width)
-    r_slice = bin_slice(value, num, width, width)
-    return r_slice << num | l_slice
+    mask = (1 << width) - 1
+    value = value & mask
+    return (value << num | value >> (width - num)) & mask
 
 
 def rotr(value: int, num: int, width: int) -> int:
     """Perform right circular shift of an integer."""
     num = num % width
-    l_slice = bin_slice(value, 0, width - num, width)
-    r_slice = bin_slice(value, width - num, width, width)
-    return r_slice << width - num | l_slice
+    mask = (1 << width) - 1
+    value = value & mask
+    return (value >> num | value << (width - num)) & mask
 
 
 def odd(num: int) -> int:
@@ -127,21 +189,20 @@ def odd(num: int) -> int:
 
 def nearest_sqrt(num: int) -> int:
     """Find nearest square root of the number."""
-    answer = 0
-    while answer ** 2 < num:
-        answer += 1
-
-    return answer
+    answer = math.isqrt(num)
+    return answer if answer ** 2 == num else answer + 1
 
 
 def egcd(a, b):
     """Extended Euclidean algorithm. Used to calculate the coefficients of
     Bézout's identity (x, y)."""
-    if a == 0:
-        return b, 0, 1
-    else:
-        g, y, x = egcd(b % a, a)
-        return g, x - (b // a) * y, y
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b != 0:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+
+    return a, x0, y0
 
 
 def mod_inv(a, m):
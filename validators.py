@@ -1,4 +1,6 @@
-from typing import Any, List
+from typing import Any, Collection
+
+import numpy as np
 
 from errors import (
     CharNotAllowedError, ValueNotInRangeError,
@@ -9,7 +11,14 @@ from errors import (
 def char_int_allowed(char_int: int) -> None:
     """Validate whether the char is allowed for input."""
     if char_int > 255:
-        raise CharNotAllowedError(chr(char_int))
+        raise CharNotAllowedError(char_int)
+
+
+def chars_allowed(char_ints: np.ndarray) -> None:
+    """Validate whether all chars are allowed for input."""
+    not_allowed_i = np.flatnonzero(char_ints > 255)
+    if len(not_allowed_i) > 0:
+        char_int_allowed(int(char_ints[not_allowed_i[0]]))
 
 
 def value_in_range(value_name: str, value: int, min_value: int,
@@ -19,7 +28,8 @@ def value_in_range(value_name: str, value: int, min_value: int,
         raise ValueNotInRangeError(value_name, value, min_value, max_value)
 
 
-def value_in_list(value_name: str, value: Any, allowed: List[Any]) -> None:
+def value_in_list(value_name: str, value: Any,
+                  allowed: Collection[Any]) -> None:
     """Validate whether the value is in the list of allowed values."""
     if value not in allowed:
         raise ValueNotInListError(value_name, value, allowed)